@@ -0,0 +1,4 @@
+"""
+Week03 Interactive Financial Dashboard: data/feature logic (utils) and
+Plotly visuals (plots) used by streamlit_app.py.
+"""
@@ -0,0 +1,181 @@
+# app/_kernels.py
+# All @njit kernels live at module level and take every parameter explicitly.
+# Never define them inside add_features or capture outer variables: each call
+# would re-JIT a new closure and Numba keeps every compiled copy alive.
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from numba import njit
+
+# Inputs are finite, positive prices (validate_df rejects anything else), so the
+# kernels carry no NaN bookkeeping and can use fastmath (FMA, reciprocal, and
+# reassociation). The no-NaN/no-Inf flags are left out because the leading
+# `window - 1` outputs are written as NaN on purpose. boundscheck off and numpy's
+# error model keep the inner loops free of checks and exception paths.
+KERNEL_OPTIONS = dict(
+    cache=True,
+    nogil=True,
+    fastmath={"nsz", "arcp", "contract", "afn", "reassoc"},
+    boundscheck=False,
+    error_model="numpy",
+)
+
+# Below this many rows, thread hand-off costs more than the kernels themselves
+PARALLEL_MIN_ROWS = 20_000
+
+# Shared by every Streamlit session; kernels are nogil, so threads truly overlap.
+# A thread pool (rather than parallel=True/prange) stays safe when several
+# sessions call in at once, which Numba's default workqueue layer is not.
+_POOL = None
+if (os.cpu_count() or 1) > 1:
+    _POOL = ThreadPoolExecutor(max_workers=3, thread_name_prefix="features")
+
+
+@njit(**KERNEL_OPTIONS)
+def rolling_welford(x, window):
+    """
+    Rolling sample std (ddof=1) in O(N) using Welford's online update, with
+    the value leaving the window removed by the reverse update. Avoids the
+    cancellation of the sum/sum-of-squares formula on long windows.
+    The first `window - 1` rows are NaN, as in pandas.
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+
+    for i in range(n):
+        x_in = x[i]
+        count += 1
+        delta = x_in - mean
+        mean += delta / count
+        m2 += delta * (x_in - mean)
+
+        if i >= window:
+            x_out = x[i - window]
+            delta = x_out - mean
+            mean -= delta / (count - 1)
+            m2 -= delta * (x_out - mean)
+            count -= 1
+
+        if i >= window - 1:
+            out[i] = np.sqrt(max(m2, 0.0) / (window - 1))
+        else:
+            out[i] = np.nan
+
+    return out
+
+
+@njit(**KERNEL_OPTIONS)
+def rolling_mean(x, window):
+    """
+    Rolling mean over a running window sum. The first `window - 1` rows are
+    NaN, as in pandas' rolling(window).mean().
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    total = 0.0
+
+    for i in range(n):
+        total += x[i]
+        if i >= window:
+            total -= x[i - window]
+
+        if i >= window - 1:
+            out[i] = total / window
+        else:
+            out[i] = np.nan
+
+    return out
+
+
+@njit(**KERNEL_OPTIONS)
+def rolling_features(close, short_window, long_window, vol_window):
+    """
+    Fused single pass over Close: running sums for both SMAs and the same
+    Welford add/remove update as rolling_welford for the volatility. One
+    read of Close instead of three, for the sequential path.
+    """
+    n = close.shape[0]
+    sma_short = np.empty(n)
+    sma_long = np.empty(n)
+    volatility = np.empty(n)
+
+    sum_s = 0.0
+    sum_l = 0.0
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+
+    for i in range(n):
+        x_in = close[i]
+        sum_s += x_in
+        sum_l += x_in
+        count += 1
+        delta = x_in - mean
+        mean += delta / count
+        m2 += delta * (x_in - mean)
+
+        if i >= short_window:
+            sum_s -= close[i - short_window]
+        if i >= long_window:
+            sum_l -= close[i - long_window]
+        if i >= vol_window:
+            x_out = close[i - vol_window]
+            delta = x_out - mean
+            mean -= delta / (count - 1)
+            m2 -= delta * (x_out - mean)
+            count -= 1
+
+        if i >= short_window - 1:
+            sma_short[i] = sum_s / short_window
+        else:
+            sma_short[i] = np.nan
+        if i >= long_window - 1:
+            sma_long[i] = sum_l / long_window
+        else:
+            sma_long[i] = np.nan
+        if i >= vol_window - 1:
+            volatility[i] = np.sqrt(max(m2, 0.0) / (vol_window - 1))
+        else:
+            volatility[i] = np.nan
+
+    return sma_short, sma_long, volatility
+
+
+def compute_features(close, short_window, long_window, vol_window):
+    """
+    SMA_Short, SMA_Long and Rolling_Volatility for Close. Close may be
+    float32 or float64; sums are accumulated and returned in float64.
+    Typical series use the fused rolling_features pass; long series are
+    split into three independent nogil kernels run concurrently on _POOL.
+    """
+    if len(close) < PARALLEL_MIN_ROWS or _POOL is None:
+        return rolling_features(close, short_window, long_window, vol_window)
+
+    sma_short = _POOL.submit(rolling_mean, close, short_window)
+    sma_long = _POOL.submit(rolling_mean, close, long_window)
+    volatility = _POOL.submit(rolling_welford, close, vol_window)
+    return sma_short.result(), sma_long.result(), volatility.result()
+
+
+def warmup() -> None:
+    """
+    Compile (or load from the cache=True on-disk cache) the kernels for the
+    signatures add_features uses, so the first request after app start does
+    not pay the JIT cost: read-only float32 (zero-copy view of fetch_data's
+    Arrow-backed Close) and writable float64 (plain pandas Close).
+    """
+    readonly_f32 = np.ones(8, dtype=np.float32)
+    readonly_f32.flags.writeable = False
+    for close in (readonly_f32, np.ones(8)):
+        rolling_features(close, 2, 3, 4)
+        # The split kernels only run on the pool path
+        if _POOL is not None:
+            rolling_mean(close, 2)
+            rolling_welford(close, 4)
+
+
+warmup()
@@ -1,6 +1,29 @@
 # app/plots.py
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
+from tsdownsample import MinMaxLTTBDownsampler
+
+# Series longer than this are downsampled before being sent to the browser
+DOWNSAMPLE_THRESHOLD = 5000
+DOWNSAMPLE_POINTS = 2000
+
+
+def downsample(S: pd.Series, n_out: int = DOWNSAMPLE_POINTS) -> tuple:
+    """
+    Return (x, y) for a trace. Long series are reduced to n_out points with
+    MinMaxLTTB, which keeps the visual shape (peaks/troughs) of the line.
+    """
+    if len(S) <= DOWNSAMPLE_THRESHOLD:
+        return S.index, S
+
+    # Leading NaNs from rolling windows are not drawn anyway
+    S = S.dropna()
+    if len(S) <= n_out:
+        return S.index, S
+
+    idx = MinMaxLTTBDownsampler().downsample(S.index.asi8, S.to_numpy(), n_out=n_out)
+    return S.index[idx], S.iloc[idx]
 
 
 def plot_price_ma(DF: pd.DataFrame, show_sma: bool = True) -> go.Figure:
@@ -13,16 +36,19 @@ def plot_price_ma(DF: pd.DataFrame, show_sma: bool = True) -> go.Figure:
     fig = go.Figure()
 
     # Close price
+    x, y = downsample(DF["Close"])
     fig.add_trace(
-        go.Scatter(x=DF.index, y=DF["Close"], mode="lines", name="Close", line=dict(width=2))
+        go.Scatter(x=x, y=y, mode="lines", name="Close", line=dict(width=2))
     )
 
     # SMAs if present and requested
     if show_sma:
         if "SMA_Short" in DF.columns:
-            fig.add_trace(go.Scatter(x=DF.index, y=DF["SMA_Short"], mode="lines", name="SMA_Short"))
+            x, y = downsample(DF["SMA_Short"])
+            fig.add_trace(go.Scatter(x=x, y=y, mode="lines", name="SMA_Short"))
         if "SMA_Long" in DF.columns:
-            fig.add_trace(go.Scatter(x=DF.index, y=DF["SMA_Long"], mode="lines", name="SMA_Long"))
+            x, y = downsample(DF["SMA_Long"])
+            fig.add_trace(go.Scatter(x=x, y=y, mode="lines", name="SMA_Long"))
 
     fig.update_layout(
         title="Close Price & Moving Averages",
@@ -36,13 +62,17 @@ def plot_price_ma(DF: pd.DataFrame, show_sma: bool = True) -> go.Figure:
 
 def plot_volume(DF: pd.DataFrame) -> go.Figure:
     """
-    Bar chart of Volume. Uses DF exactly as in your notebook.
+    Volume as a filled WebGL step line (one GPU draw instead of an SVG rect
+    per bar). Uses DF exactly as in your notebook.
     """
     if DF is None or DF.empty:
         raise ValueError("DF is empty. Cannot plot volume.")
 
     fig = go.Figure()
-    fig.add_trace(go.Bar(x=DF.index, y=DF["Volume"], name="Volume"))
+    x, y = downsample(DF["Volume"])
+    fig.add_trace(
+        go.Scattergl(x=x, y=y, mode="lines", line_shape="hv", fill="tozeroy", name="Volume")
+    )
     fig.update_layout(title="Trading Volume", xaxis_title="Date", yaxis_title="Volume", hovermode="x")
     return fig
 
@@ -50,13 +80,17 @@ def plot_volume(DF: pd.DataFrame) -> go.Figure:
 def plot_return_dist(DF: pd.DataFrame, nbins: int = 100) -> go.Figure:
     """
     Histogram of daily_return. Uses column name 'daily_return' per notebook.
+    Binned server-side so only the bin counts are sent to the browser.
     """
     if "daily_return" not in DF.columns:
         raise ValueError("DF does not contain 'daily_return'. Run add_features first.")
 
-    returns = DF["daily_return"].dropna()
+    returns = DF["daily_return"].dropna().to_numpy()
+    counts, edges = np.histogram(returns, bins=nbins)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+
     fig = go.Figure()
-    fig.add_trace(go.Histogram(x=returns, nbinsx=nbins, name="daily_return"))
+    fig.add_trace(go.Bar(x=centers, y=counts, width=np.diff(edges), name="daily_return"))
     fig.update_layout(title="Daily Return Distribution", xaxis_title="daily_return", yaxis_title="Count")
     return fig
 
@@ -69,6 +103,7 @@ def plot_volatility(DF: pd.DataFrame) -> go.Figure:
         raise ValueError("DF does not contain 'Rolling_Volatility'. Run add_features first.")
 
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=DF.index, y=DF["Rolling_Volatility"], mode="lines", name="Rolling_Volatility"))
+    x, y = downsample(DF["Rolling_Volatility"])
+    fig.add_trace(go.Scatter(x=x, y=y, mode="lines", name="Rolling_Volatility"))
     fig.update_layout(title="Rolling Volatility (price-based)", xaxis_title="Date", yaxis_title="Volatility")
     return fig
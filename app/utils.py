@@ -0,0 +1,247 @@
+# app/utils.py
+import contextlib
+import os
+import re
+import tempfile
+import time
+from datetime import date
+
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import yfinance as yf
+
+try:
+    from app._kernels import compute_features
+except ImportError:
+    # Numba/llvmlite unavailable on this platform: fall back to bottleneck's
+    # compiled moving-window functions (no JIT, same NaN semantics as pandas)
+    import bottleneck as bn
+    compute_features = None
+
+# Keep the notebook naming and behavior: DF is the DataFrame variable name.
+REQUIRED_COLS = {"Open", "High", "Low", "Close", "Volume"}
+
+# Columns carried into the feature frame; the charts only use Close, Volume and
+# derived columns (Raw Data / CSV re-join the full OHLCV in streamlit_app.py)
+FEATURE_INPUT_COLS = ["Close", "Volume"]
+
+# float32 keeps ~7 significant digits, plenty for equity prices, at half the bytes
+PRICE_COLS = ["Open", "High", "Low", "Close"]
+
+# On-disk parquet cache for fetch_data; survives Streamlit worker restarts.
+# Only closed historical ranges are cached, and files expire after the TTL.
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "week03_dashboard_cache")
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def flatten_columns(DF: pd.DataFrame) -> pd.DataFrame:
+    """
+    Flatten MultiIndex columns from yfinance if present.
+    Returns the same DF object type with flattened columns.
+    """
+    if isinstance(DF.columns, pd.MultiIndex):
+        DF.columns = DF.columns.get_level_values(0)
+    return DF
+
+
+def _rolling_bottleneck(func, close: np.ndarray, window: int, **kwargs) -> np.ndarray:
+    """
+    bottleneck moving-window call with pandas' rolling(window) semantics.
+    """
+    # bottleneck rejects windows longer than the data; pandas returns all NaN
+    if window > len(close):
+        return np.full(len(close), np.nan)
+    return func(close, window, min_count=window, **kwargs)
+
+
+def _check_columns(DF: pd.DataFrame) -> None:
+    """
+    Raise ValueError if any of REQUIRED_COLS is missing from DF.
+    """
+    missing = REQUIRED_COLS - set(DF.columns)
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+
+def _check_close(close: np.ndarray) -> None:
+    """
+    Raise ValueError unless every Close is finite and positive; the fastmath
+    kernels in _kernels.py carry no NaN handling and rely on this.
+    """
+    if not np.isfinite(close).all() or (close <= 0).any():
+        raise ValueError("Close must contain only finite, positive prices")
+
+
+def _cache_path(ticker: str, start: str, end: str) -> str:
+    """
+    Parquet file for a (ticker, start, end) download; ticker is sanitized
+    since it comes straight from user input.
+    """
+    safe_ticker = re.sub(r"[^A-Z0-9.^=-]", "_", ticker.upper())
+    return os.path.join(CACHE_DIR, f"{safe_ticker}_{start}_{end}.parquet")
+
+
+def _is_cacheable(end: str) -> bool:
+    """
+    Only ranges that end before today are cached on disk; a range ending today
+    or later still gains new bars.
+    """
+    try:
+        return date.fromisoformat(end) < date.today()
+    except ValueError:
+        return False
+
+
+def _write_cache(DF: pd.DataFrame, path: str) -> None:
+    """
+    Best effort: write to a temp file and rename, so concurrent sessions never
+    read a half-written parquet. Expired files are pruned on the way; a
+    read-only filesystem just skips caching.
+    """
+    tmp_path = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        expired = time.time() - CACHE_TTL_SECONDS
+        for entry in os.scandir(CACHE_DIR):
+            if entry.stat().st_mtime < expired:
+                with contextlib.suppress(OSError):
+                    os.remove(entry.path)
+
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        DF.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except (OSError, ValueError):
+        if tmp_path is not None:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+
+
+def clear_cached_download(ticker: str, start: str, end: str) -> None:
+    """
+    Drop the on-disk copy of one download so the next fetch_data re-downloads it.
+    """
+    with contextlib.suppress(OSError):
+        os.remove(_cache_path(ticker, start, end))
+
+
+def fetch_data(ticker: str, start: str, end: str) -> pd.DataFrame:
+    """
+    Fetch OHLCV using yfinance and return DF (DatetimeIndex) with pyarrow-backed
+    columns, so Streamlit's Arrow transport and CSV export skip a conversion.
+    Mirrors notebook behavior: returns DF or raises ValueError if empty.
+    Historical ranges are cached as parquet under CACHE_DIR for CACHE_TTL_SECONDS
+    (see clear_cached_download to force a re-download).
+    """
+    path = _cache_path(ticker, start, end) if _is_cacheable(end) else None
+    if path is not None:
+        try:
+            if time.time() - os.path.getmtime(path) < CACHE_TTL_SECONDS:
+                return pd.read_parquet(path)
+        except (OSError, ValueError):
+            pass  # missing, unreadable or partial cache file: re-download
+
+    # yfinance keeps one shared HTTP session per process, so no session is passed here
+    DF = yf.download(ticker, start=start, end=end, progress=False)
+    if DF is None or DF.empty:
+        raise ValueError(f"No data found for {ticker}. Check ticker or date range.")
+    DF = flatten_columns(DF)
+    DF.index = pd.to_datetime(DF.index)
+    # The cleanup below indexes Close/Volume/PRICE_COLS directly
+    _check_columns(DF)
+
+    # yfinance can emit rows without a Close (e.g. exchange holidays); they carry
+    # no price and would fail validate_df's finite-Close check. Re-check for empty
+    # afterwards so an all-NaN download is reported (and never cached).
+    DF = DF.dropna(subset=["Close"])
+    if DF.empty:
+        raise ValueError(f"No data found for {ticker}. Check ticker or date range.")
+
+    # Downcast for memory and cache locality; Volume only when it fits in int32
+    # (crypto/FX volumes can exceed 2**31)
+    DF = DF.astype({col: np.float32 for col in PRICE_COLS})
+    volume = DF["Volume"]
+    if pd.api.types.is_integer_dtype(volume) and volume.abs().max() <= np.iinfo(np.int32).max:
+        DF["Volume"] = volume.astype(np.int32)
+
+    # Same (downcast) dtypes, just Arrow-backed (convert_dtypes would turn
+    # integral-valued price columns into int64)
+    DF = DF.astype({col: pd.ArrowDtype(pa.from_numpy_dtype(dtype)) for col, dtype in DF.dtypes.items()})
+
+    if path is not None:
+        _write_cache(DF, path)
+    return DF
+
+
+def validate_df(DF: pd.DataFrame) -> None:
+    """
+    Validate the DF structure (same checks as Phase-1 expectations).
+    Raises ValueError for problem cases.
+    """
+    _check_columns(DF)
+
+    if not isinstance(DF.index, pd.DatetimeIndex):
+        raise ValueError("Index must be a DatetimeIndex")
+
+    if DF.index.has_duplicates:
+        raise ValueError("Duplicate timestamps detected in DF.index")
+
+    # The fastmath kernels in _kernels.py assume finite, positive prices
+    _check_close(DF["Close"].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    # Notebook expects sorted index; enforce it
+    if not DF.index.is_monotonic_increasing:
+        DF.sort_index(inplace=True)
+
+
+def add_features(DF: pd.DataFrame, short_window: int, long_window: int, vol_window: int) -> pd.DataFrame:
+    """
+    Add Phase-1 style features to DF and return a new DataFrame holding
+    Close, Volume and the derived columns (Open/High/Low are dropped).
+    - daily_return (same formula as notebook)
+    - SMA_Short
+    - SMA_Long
+    - Rolling_Volatility (price-based rolling std, NOT annualized) 
+    Raises ValueError if Close has NaN/inf or non-positive prices (same check
+    as validate_df), since the kernels would otherwise silently return NaNs.
+    """
+    if DF is None or DF.empty:
+        raise ValueError("Cannot compute features on an empty DF")
+
+    # Slim, shallow copy: new columns land only on DF_out, so the notebook variable
+    # is not mutated, and unused OHLC columns are not carried along
+    DF_out = DF[FEATURE_INPUT_COLS].copy(deep=False)
+
+    # float32 Close (from fetch_data) is passed through as-is; kernels accumulate in float64
+    close = DF_out["Close"].to_numpy(na_value=np.nan)
+    if close.dtype != np.float32:
+        close = close.astype(np.float64, copy=False)
+    _check_close(close)
+
+    # daily_return: same as your notebook (simple pct change), vectorized on the ndarray
+    daily_return = np.empty(len(close))
+    daily_return[0] = np.nan
+    np.divide(close[1:], close[:-1], out=daily_return[1:], dtype=np.float64)
+    daily_return[1:] -= 1.0
+
+    # SMAs and rolling volatility (price-based): Numba kernels, else bottleneck
+    if compute_features is not None:
+        sma_short, sma_long, volatility = compute_features(
+            close, short_window, long_window, vol_window
+        )
+    else:
+        # bottleneck computes in the input dtype; upcast so float32 Close gives the
+        # same float64 precision (and column dtypes) as the Numba path
+        close64 = close.astype(np.float64)
+        sma_short = _rolling_bottleneck(bn.move_mean, close64, short_window)
+        sma_long = _rolling_bottleneck(bn.move_mean, close64, long_window)
+        volatility = _rolling_bottleneck(bn.move_std, close64, vol_window, ddof=1)
+
+    DF_out["daily_return"] = daily_return
+    DF_out["SMA_Short"] = sma_short
+    DF_out["SMA_Long"] = sma_long
+    DF_out["Rolling_Volatility"] = volatility
+
+    return DF_out
+
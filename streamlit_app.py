@@ -1,27 +1,26 @@
 """
 Streamlit UI for Week03 - Interactive Financial Dashboard.
-Uses Phase-1 feature logic from utils.py and Plotly visuals from plots.py.
+Uses Phase-1 feature logic from app/utils.py and Plotly visuals from app/plots.py.
 """
 
 # -------------------------
 # Imports
 # -------------------------
-import os
-import sys
 from datetime import date, datetime
+from functools import partial
 import io
 
 import streamlit as st
 import pandas as pd
 import numpy as np
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 
-# Ensure current directory is in Python path (robust for Streamlit Cloud)
-CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-if CURRENT_DIR not in sys.path:
-    sys.path.append(CURRENT_DIR)
-
-from utils import fetch_data, validate_df, add_features
-from plots import (
+# Streamlit puts this script's directory on sys.path, so the app package imports
+# directly; a single import path means utils/_kernels load (and JIT) only once
+from app.utils import fetch_data, validate_df, add_features, clear_cached_download
+from app.plots import (
     plot_price_ma,
     plot_volume,
     plot_return_dist,
@@ -43,6 +42,86 @@ st.set_page_config(
 def cached_fetch(ticker: str, start_iso: str, end_iso: str, refresh_token: int) -> pd.DataFrame:
     return fetch_data(ticker, start_iso, end_iso)
 
+# -------------------------
+# Cached features (keyed on scalars only, so UI-only reruns hit the cache)
+# -------------------------
+@st.cache_data(show_spinner=False)
+def cached_features(
+    ticker: str,
+    start_iso: str,
+    end_iso: str,
+    short_window: int,
+    long_window: int,
+    vol_window: int,
+    refresh_token: int
+) -> pd.DataFrame:
+    DF = cached_fetch(ticker, start_iso, end_iso, refresh_token)
+    validate_df(DF)
+    return add_features(DF, short_window, long_window, vol_window)
+
+# -------------------------
+# Cached figures (feature_key is the cached_features argument tuple)
+# Figures are shared read-only across reruns, so cache_resource avoids
+# rebuilding traces when only unrelated widgets change.
+# -------------------------
+@st.cache_resource(show_spinner=False, max_entries=64)
+def cached_price_fig(feature_key: tuple, show_sma: bool) -> go.Figure:
+    return plot_price_ma(cached_features(*feature_key), show_sma)
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def cached_volume_fig(feature_key: tuple) -> go.Figure:
+    return plot_volume(cached_features(*feature_key))
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def cached_return_dist_fig(feature_key: tuple) -> go.Figure:
+    return plot_return_dist(cached_features(*feature_key))
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def cached_volatility_fig(feature_key: tuple) -> go.Figure:
+    return plot_volatility(cached_features(*feature_key))
+
+# -------------------------
+# Cached Raw Data frame: the feature frame only carries Close/Volume for the
+# charts, so Raw Data and the CSV export re-join the full validated OHLCV
+# -------------------------
+@st.cache_resource(show_spinner=False, max_entries=8)
+def cached_raw_frame(feature_key: tuple) -> pd.DataFrame:
+    ticker, start_iso, end_iso, *_, refresh_token = feature_key
+    DF = cached_fetch(ticker, start_iso, end_iso, refresh_token)
+    validate_df(DF)
+    DF_out = cached_features(*feature_key)
+    return DF.join(DF_out.drop(columns=DF_out.columns.intersection(DF.columns)))
+
+
+# Converted to Arrow once, then handed to st.dataframe as-is
+@st.cache_resource(show_spinner=False, max_entries=64)
+def cached_tail_table(feature_key: tuple, n_rows: int) -> pa.Table:
+    return pa.Table.from_pandas(cached_raw_frame(feature_key).tail(n_rows))
+
+# -------------------------
+# CSV export (called lazily by the download button, not on every rerun)
+# -------------------------
+def csv_bytes(DF: pd.DataFrame) -> bytes:
+    # Arrow's vectorized CSV writer instead of pandas' per-value formatting
+    table = pa.Table.from_pandas(DF.reset_index(), preserve_index=False)
+
+    # Daily bars: write dates as 2020-01-02 (like DF.to_csv), not full timestamps
+    date_field = table.schema.field(0)
+    if pa.types.is_timestamp(date_field.type):
+        table = table.set_column(0, date_field.name, table.column(0).cast(pa.date32()))
+
+    # Unquoted header and values, same layout as DF.to_csv (Arrow always quotes
+    # header names, so the header line is written here)
+    csv_buffer = io.BytesIO()
+    csv_buffer.write((",".join(table.column_names) + "\n").encode())
+    pa_csv.write_csv(
+        table, csv_buffer, pa_csv.WriteOptions(include_header=False, quoting_style="none")
+    )
+    return csv_buffer.getvalue()
+
 # -------------------------
 # Session state
 # -------------------------
@@ -65,14 +144,12 @@ with st.sidebar:
     LONG_SMA = st.slider("Long SMA", 5, 200, 50)
     VOL_WINDOW = st.slider("Volatility window", 5, 252, 20)
 
-    SHOW_SMA = st.checkbox("Show SMA", True)
-    SHOW_VOLUME = st.checkbox("Show Volume", True)
-    SHOW_RETURNS = st.checkbox("Show Returns", True)
-    SHOW_VOL = st.checkbox("Show Volatility", True)
-
+    # The click itself already triggers this rerun, and the fetch below runs
+    # after the bump, so no extra st.rerun() is needed
     if st.button("Refresh"):
         st.session_state.refresh_token += 1
-        st.rerun()
+        # Only the currently selected download is re-fetched from Yahoo
+        clear_cached_download(TICKER, START_DATE.isoformat(), END_DATE.isoformat())
 
 # -------------------------
 # Validation
@@ -103,7 +180,16 @@ except Exception as e:
 # -------------------------
 # Feature engineering
 # -------------------------
-DF_out = add_features(DF, SHORT_SMA, LONG_SMA, VOL_WINDOW)
+FEATURE_KEY = (
+    TICKER,
+    START_DATE.isoformat(),
+    END_DATE.isoformat(),
+    SHORT_SMA,
+    LONG_SMA,
+    VOL_WINDOW,
+    st.session_state.refresh_token
+)
+DF_out = cached_features(*FEATURE_KEY)
 
 if LONG_SMA <= SHORT_SMA:
     st.warning("Long SMA is not greater than Short SMA (allowed but uncommon).")
@@ -128,6 +214,34 @@ c1, c2, _ = st.columns(3)
 c1.metric("Mean Daily Return", f"{mean_daily:.4%}")
 c2.metric("Annualized Volatility", f"{ann_vol:.2%}")
 
+# -------------------------
+# Tab fragments
+# Each tab owns its show/hide checkbox inside an st.fragment, so toggling it
+# reruns only that tab instead of the whole script.
+# -------------------------
+@st.fragment
+def render_price(feature_key: tuple) -> None:
+    show_sma = st.checkbox("Show SMA", True)
+    st.plotly_chart(cached_price_fig(feature_key, show_sma), width="stretch")
+
+
+@st.fragment
+def render_volume(feature_key: tuple) -> None:
+    if st.checkbox("Show Volume", True):
+        st.plotly_chart(cached_volume_fig(feature_key), width="stretch")
+
+
+@st.fragment
+def render_returns(feature_key: tuple) -> None:
+    if st.checkbox("Show Returns", True):
+        st.plotly_chart(cached_return_dist_fig(feature_key), width="stretch")
+
+
+@st.fragment
+def render_volatility(feature_key: tuple) -> None:
+    if st.checkbox("Show Volatility", True):
+        st.plotly_chart(cached_volatility_fig(feature_key), width="stretch")
+
 # -------------------------
 # Tabs
 # -------------------------
@@ -136,24 +250,26 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs(
 )
 
 with tab1:
-    st.plotly_chart(plot_price_ma(DF_out, SHOW_SMA), use_container_width=True)
+    render_price(FEATURE_KEY)
 
 with tab2:
-    if SHOW_VOLUME:
-        st.plotly_chart(plot_volume(DF_out), use_container_width=True)
+    render_volume(FEATURE_KEY)
 
 with tab3:
-    if SHOW_RETURNS:
-        st.plotly_chart(plot_return_dist(DF_out), use_container_width=True)
+    render_returns(FEATURE_KEY)
 
 with tab4:
-    if SHOW_VOL:
-        st.plotly_chart(plot_volatility(DF_out), use_container_width=True)
+    render_volatility(FEATURE_KEY)
 
 with tab5:
-    st.dataframe(DF_out.tail(500))
-    csv = DF_out.to_csv(index=True).encode()
-    st.download_button("Download CSV", csv, f"{TICKER}.csv", "text/csv")
+    st.dataframe(cached_tail_table(FEATURE_KEY, 500))
+    st.download_button(
+        "Download CSV",
+        partial(csv_bytes, cached_raw_frame(FEATURE_KEY)),
+        f"{TICKER}.csv",
+        "text/csv",
+        on_click="ignore"
+    )
 
 # -------------------------
 # Footer
@@ -1,4 +1,11 @@
 # tests/quick_test.py
+import resource
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from app import _kernels
 from app.utils import fetch_data, validate_df, add_features
 from app.plots import plot_price_ma, plot_return_dist
 # NOTE: run in a normal Python env (not Streamlit). Plotly figures may open in browser if you call fig.show()
@@ -13,7 +20,53 @@ DF_out = add_features(DF, short_window=5, long_window=20, vol_window=10)
 # 3) quick print to confirm columns (uppercase names preserved)
 print(DF_out.columns.tolist())
 
-# 4) plot (will return Plotly figures)
+# 4) custom rolling kernels must match pandas (values and NaN positions)
+close = pd.Series(DF["Close"].to_numpy(dtype=np.float64), index=DF.index)
+for short_w, long_w, vol_w in [(5, 20, 10), (10, 50, 20), (20, 200, 252)]:
+    feats = add_features(DF, short_window=short_w, long_window=long_w, vol_window=vol_w)
+    expected = {
+        "SMA_Short": close.rolling(short_w).mean(),
+        "SMA_Long": close.rolling(long_w).mean(),
+        "Rolling_Volatility": close.rolling(vol_w).std(),
+    }
+    for col, ref in expected.items():
+        assert np.allclose(feats[col].to_numpy(), ref.to_numpy(), equal_nan=True), (
+            f"{col} differs from pandas for windows {(short_w, long_w, vol_w)}"
+        )
+print("Rolling kernels match pandas rolling mean/std")
+
+# 5) pooled path (>= PARALLEL_MIN_ROWS rows) must match the fused kernel and pandas;
+#    force a pool so this also runs on single-CPU hosts
+long_close = np.resize(close.to_numpy(), _kernels.PARALLEL_MIN_ROWS + 1000)
+saved_pool = _kernels._POOL
+_kernels._POOL = ThreadPoolExecutor(max_workers=3)
+try:
+    pooled = _kernels.compute_features(long_close, 10, 50, 252)
+finally:
+    _kernels._POOL.shutdown()
+    _kernels._POOL = saved_pool
+fused = _kernels.rolling_features(long_close, 10, 50, 252)
+long_series = pd.Series(long_close)
+expected = (
+    long_series.rolling(10).mean(),
+    long_series.rolling(50).mean(),
+    long_series.rolling(252).std(),
+)
+for pooled_col, fused_col, ref in zip(pooled, fused, expected):
+    assert np.allclose(pooled_col, fused_col, equal_nan=True), "pooled kernels differ from rolling_features"
+    assert np.allclose(pooled_col, ref.to_numpy(), equal_nan=True), "pooled kernels differ from pandas"
+print("Pooled rolling kernels match rolling_features and pandas")
+
+# 6) repeated add_features must not leak: kernels are module-level @njit, so calls
+#    reuse the compiled code instead of JIT-compiling (and keeping) new copies
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+for _ in range(1000):
+    add_features(DF, short_window=5, long_window=20, vol_window=10)
+rss_growth_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+assert rss_growth_mb < 10, f"add_features grew RSS by {rss_growth_mb:.1f} MB over 1000 calls"
+print(f"RSS growth over 1000 add_features calls: {rss_growth_mb:.1f} MB")
+
+# 7) plot (will return Plotly figures)
 fig_price = plot_price_ma(DF_out, show_sma=True)
 fig_hist = plot_return_dist(DF_out)
 